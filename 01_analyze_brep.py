@@ -17,9 +17,20 @@ Author: Created during Claude session
 Date: 2025-11-08
 """
 
+import os
+import sys
+
 import rhinoscriptsyntax as rs
 import Rhino
 
+# Shared helpers live next to this script
+_here = os.path.dirname(os.path.abspath(__file__))
+if _here not in sys.path:
+    sys.path.append(_here)
+
+import brep_loader  # uses brep_utils.dll when built and up to date
+from brep_utils import classify_faces, PLANE, CYLINDER, CONE, NURBS, OTHER
+
 print("="*80)
 print("  BREP ANALYSIS - SURFACE TYPE DETECTION")
 print("="*80)
@@ -44,48 +55,32 @@ else:
             total_faces = geo.Faces.Count
             print("\n📊 Total faces: {}".format(total_faces))
             
-            # Counters
-            cylinders = 0
-            cones = 0
-            planes = 0
-            nurbs = 0
-            others = 0
-            
-            cylinders_above_threshold = 0
             DIAMETER_THRESHOLD = 3.2  # mm
             
+            # Also test NURBS faces for planarity (slow, for imported files
+            # where planes were converted to NURBS)
+            CHECK_PLANAR_NURBS = False
+            
+            # "all": count every surface type
+            # "threshold_only": only count cylinders Ø > threshold (faster)
+            COUNT_MODE = "all"
+            threshold_only = COUNT_MODE == "threshold_only"
+            
             print("\n⏳ Analyzing faces...")
             
-            for face_idx in range(total_faces):
-                face = geo.Faces[face_idx]
-                surf = face.UnderlyingSurface()
-                
-                # Check surface types
-                is_cyl, cyl = surf.TryGetCylinder()
-                is_cone, cone = surf.TryGetCone()
-                is_planar = face.IsPlanar()
-                
-                if is_cyl:
-                    cylinders += 1
-                    diameter = cyl.Radius * 2
-                    if diameter > DIAMETER_THRESHOLD:
-                        cylinders_above_threshold += 1
-                
-                elif is_cone:
-                    cones += 1
-                
-                elif is_planar:
-                    planes += 1
-                
-                elif surf.GetType().Name in ["NurbsSurface", "SumSurface", "RevSurface"]:
-                    nurbs += 1
-                
-                else:
-                    others += 1
-                
-                # Progress indicator
-                if (face_idx + 1) % 100 == 0:
-                    print("   Processed {} faces...".format(face_idx + 1))
+            # One call classifies every face
+            codes, radii = classify_faces(geo, CHECK_PLANAR_NURBS, threshold_only)
+            
+            # Counters
+            cylinders = codes.count(CYLINDER)
+            cones = codes.count(CONE)
+            planes = codes.count(PLANE)
+            nurbs = codes.count(NURBS)
+            others = codes.count(OTHER)
+            
+            cylinders_above_threshold = sum(
+                1 for code, radius in zip(codes, radii)
+                if code == CYLINDER and radius * 2 > DIAMETER_THRESHOLD)
             
             # Results
             print("\n" + "="*80)
@@ -93,10 +88,11 @@ else:
             print("="*80)
             print("🔵 Cylinders: {}".format(cylinders))
             print("   └─ Ø>{:.1f}mm: {}".format(DIAMETER_THRESHOLD, cylinders_above_threshold))
-            print("🔺 Cones: {}".format(cones))
-            print("⬜ Planes: {}".format(planes))
-            print("📐 NURBS: {}".format(nurbs))
-            print("❓ Others: {}".format(others))
+            if not threshold_only:
+                print("🔺 Cones: {}".format(cones))
+                print("⬜ Planes: {}".format(planes))
+                print("📐 NURBS: {}".format(nurbs))
+                print("❓ Others: {}".format(others))
             print("="*80)
             print("✅ Total: {}".format(cylinders + cones + planes + nurbs + others))
     else:
@@ -16,9 +16,20 @@ Author: Created during Claude session
 Date: 2025-11-08
 """
 
+import os
+import sys
+
 import rhinoscriptsyntax as rs
 import Rhino
 
+# Shared helpers live next to this script
+_here = os.path.dirname(os.path.abspath(__file__))
+if _here not in sys.path:
+    sys.path.append(_here)
+
+import brep_loader  # uses brep_utils.dll when built and up to date
+from brep_utils import CAN_BE_CONE, CAN_BE_CYLINDER, NURBS_CLASSES, face_bounding_box
+
 print("="*80)
 print("  DETAILED SURFACE ANALYSIS")
 print("="*80)
@@ -66,11 +77,11 @@ else:
                 face = geo if hasattr(geo, 'PointAt') else None
             
             # Surface type
-            surf_type = surf.GetType().Name
+            surf_type = type(surf).__name__
             print("Surface class: {}".format(surf_type))
             
-            # BoundingBox
-            bbox = surf.GetBoundingBox(True)
+            # BoundingBox (cached between runs)
+            bbox = face_bounding_box(obj, 0, surf)
             print("\nBoundingBox:")
             print("  X: {:.1f} to {:.1f} (size {:.1f})".format(
                 bbox.Min.X, bbox.Max.X, bbox.Max.X - bbox.Min.X))
@@ -82,7 +93,8 @@ else:
             print("\n--- TYPE CHECK ---")
             
             # Cylinder
-            is_cyl, cyl = surf.TryGetCylinder()
+            is_cyl, cyl = (surf.TryGetCylinder() if surf_type in CAN_BE_CYLINDER
+                           else (False, None))
             if is_cyl:
                 print("✅ CYLINDER")
                 print("   Radius: {:.3f}mm".format(cyl.Radius))
@@ -93,7 +105,8 @@ else:
                 print("❌ NOT a cylinder")
             
             # Cone
-            is_cone, cone = surf.TryGetCone()
+            is_cone, cone = (surf.TryGetCone() if surf_type in CAN_BE_CONE
+                             else (False, None))
             if is_cone:
                 print("\n✅ CONE!")
                 print("   Base radius: {:.3f}mm".format(cone.Radius))
@@ -119,7 +132,7 @@ else:
                 print("❌ NOT a plane")
             
             # NURBS parameters
-            if surf_type in ["NurbsSurface", "SumSurface", "RevSurface"]:
+            if surf_type in NURBS_CLASSES:
                 print("\n--- NURBS PARAMETERS ---")
                 print("Type: {}".format(surf_type))
                 
@@ -133,9 +146,7 @@ else:
             
             # Center of face
             if face and hasattr(face, 'Domain'):
-                u = (face.Domain(0).Min + face.Domain(0).Max) / 2
-                v = (face.Domain(1).Min + face.Domain(1).Max) / 2
-                c = face.PointAt(u, v)
+                c = face.PointAt(face.Domain(0).Mid, face.Domain(1).Mid)
                 
                 print("\nFace center: ({:.0f}, {:.0f}, {:.0f})".format(c.X, c.Y, c.Z))
             
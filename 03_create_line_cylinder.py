@@ -18,10 +18,21 @@ Author: Created during Claude session
 Date: 2025-11-08
 """
 
+import os
+import sys
+
 import rhinoscriptsyntax as rs
 import Rhino
 import scriptcontext as sc
 
+# Shared helpers live next to this script
+_here = os.path.dirname(os.path.abspath(__file__))
+if _here not in sys.path:
+    sys.path.append(_here)
+
+import brep_loader  # uses brep_utils.dll when built and up to date
+from brep_utils import project_cyl_axis
+
 print("CREATE LINE ON CYLINDER AXIS")
 
 sel = rs.SelectedObjects()
@@ -49,30 +60,8 @@ else:
             print("   Center: ({:.0f}, {:.0f}, {:.0f})".format(
                 cyl.Center.X, cyl.Center.Y, cyl.Center.Z))
             
-            # Cylinder axis
-            axis = cyl.Axis
-            cyl_center = cyl.Center
-            
-            # Face boundaries in V direction (along axis)
-            u_mid = (face.Domain(0).Min + face.Domain(0).Max) / 2
-            v_min = face.Domain(1).Min
-            v_max = face.Domain(1).Max
-            
-            # Points at face edges
-            p1 = face.PointAt(u_mid, v_min)
-            p2 = face.PointAt(u_mid, v_max)
-            
-            # Project onto cylinder axis
-            v1 = p1 - cyl_center
-            v2 = p2 - cyl_center
-            
-            # Projection parameters
-            t1 = v1.X * axis.X + v1.Y * axis.Y + v1.Z * axis.Z
-            t2 = v2.X * axis.X + v2.Y * axis.Y + v2.Z * axis.Z
-            
-            # Line along axis
-            start = cyl_center + axis * t1
-            end = cyl_center + axis * t2
+            # Face edge points projected onto the cylinder axis
+            start, end = project_cyl_axis(face, cyl)
             
             print("Start: ({:.0f}, {:.0f}, {:.0f})".format(start.X, start.Y, start.Z))
             print("End: ({:.0f}, {:.0f}, {:.0f})".format(end.X, end.Y, end.Z))
@@ -83,7 +72,7 @@ else:
             if ln:
                 rs.ObjectColor(ln, [0, 255, 0])  # Green
                 
-                length = ((end.X - start.X)**2 + (end.Y - start.Y)**2 + (end.Z - start.Z)**2)**0.5
+                length = start.DistanceTo(end)
                 
                 print("\n✅ GREEN LINE CREATED!")
                 print("   Length: {:.1f}mm".format(length))
@@ -21,10 +21,25 @@ Author: Created during Claude session
 Date: 2025-11-08
 """
 
+import os
+import sys
+
 import rhinoscriptsyntax as rs
 import Rhino
 import scriptcontext as sc
 
+# Shared helpers live next to this script
+_here = os.path.dirname(os.path.abspath(__file__))
+if _here not in sys.path:
+    sys.path.append(_here)
+
+import brep_loader  # uses brep_utils.dll when built and up to date
+from brep_utils import (CONE, CYLINDER, add_colored_lines, classify_and_collect,
+                        face_axis_points, project_axes)
+
+GREEN = (0, 255, 0)  # Cylinder lines
+RED = (255, 0, 0)    # Cone lines
+
 print("="*80)
 print("  BATCH SURFACE PROCESSING")
 print("="*80)
@@ -36,95 +51,85 @@ if not sel:
 else:
     print("\n✅ Selected: {} surfaces".format(len(sel)))
     
-    lines_created = 0
+    # Surfaces and polysurfaces are stored as Breps, read them directly;
+    # one face (the first) per selected object, None for anything else
+    find = sc.doc.Objects.Find
+    faces = []
+    for obj in sel:
+        rhobj = find(obj)
+        brep = rhobj.Geometry if rhobj else None
+        if isinstance(brep, Rhino.Geometry.Brep) and brep.Faces.Count > 0:
+            faces.append(brep.Faces[0])
+        else:
+            faces.append(None)
+    
+    # (p1, p2, center, axis) per cylinder, projected after the loop
+    cyl_items = []
     
-    for idx, obj in enumerate(sel, 1):
-        print("\n" + "-"*60)
-        print("SURFACE #{}".format(idx))
-        print("-"*60)
+    # (start, end) per cone, added after the loop
+    red_pairs = []
+    
+    # Per-surface report, printed once after the loop: every print goes
+    # through Rhino's command line and is slow for large selections
+    out = []
+    
+    # One classification pass collects the work for both line colors
+    results = classify_and_collect(f for f in faces if f is not None)
+    
+    for idx, face in enumerate(faces, 1):
+        out.append("\n" + "-"*60)
+        out.append("SURFACE #{}".format(idx))
+        out.append("-"*60)
+        
+        if face is None:
+            out.append("❓ Not a surface")
+            continue
         
-        t = rs.ObjectType(obj)
+        code, face, shape, stype = next(results)
+        out.append("Type: {}".format(stype))
         
-        if t == 8 or t == 16:
-            geo = rs.coercebrep(obj) if t == 16 else rs.coercesurface(obj)
+        if code == CONE:
+            cone = shape
+            out.append("🔺 CONE!")
+            out.append("   R={:.1f}mm Angle={:.1f}°".format(
+                cone.Radius, cone.AngleInDegrees))
             
-            if geo:
-                # Get surface
-                if t == 16 and hasattr(geo, 'Faces') and geo.Faces.Count > 0:
-                    face = geo.Faces[0]
-                    surf = face.UnderlyingSurface()
-                else:
-                    surf = geo
-                    face = geo if hasattr(geo, 'PointAt') else None
-                
-                surf_type = surf.GetType().Name
-                
-                # Check types
-                is_cyl, cyl = surf.TryGetCylinder()
-                is_cone, cone = surf.TryGetCone()
-                
-                print("Type: {}".format(surf_type))
-                
-                if is_cone:
-                    print("🔺 CONE!")
-                    print("   R={:.1f}mm Angle={:.1f}°".format(
-                        cone.Radius, cone.AngleInDegrees))
-                    
-                    # Face center
-                    if face and hasattr(face, 'Domain'):
-                        u = (face.Domain(0).Min + face.Domain(0).Max) / 2
-                        v = (face.Domain(1).Min + face.Domain(1).Max) / 2
-                        c = face.PointAt(u, v)
-                    else:
-                        c = cone.ApexPoint
-                    
-                    ax = cone.Axis
-                    s = c - ax * 2.5
-                    e = c + ax * 2.5
-                    
-                    ln = rs.AddLine(s, e)
-                    if ln:
-                        rs.ObjectColor(ln, [255, 0, 0])  # Red for cone
-                        lines_created += 1
-                        print("   ✅ RED line created")
-                
-                elif is_cyl:
-                    diameter = cyl.Radius * 2
-                    print("🔵 CYLINDER Ø{:.1f}mm".format(diameter))
-                    
-                    if face:
-                        u_mid = (face.Domain(0).Min + face.Domain(0).Max) / 2
-                        v_mid = (face.Domain(1).Min + face.Domain(1).Max) / 2
-                        center = face.PointAt(u_mid, v_mid)
-                        
-                        axis = cyl.Axis
-                        cyl_center = cyl.Center
-                        
-                        # Boundaries
-                        v_min = face.Domain(1).Min
-                        v_max = face.Domain(1).Max
-                        
-                        p1 = face.PointAt(u_mid, v_min)
-                        p2 = face.PointAt(u_mid, v_max)
-                        
-                        # Project to axis
-                        v1 = p1 - cyl_center
-                        v2 = p2 - cyl_center
-                        
-                        t1 = v1.X * axis.X + v1.Y * axis.Y + v1.Z * axis.Z
-                        t2 = v2.X * axis.X + v2.Y * axis.Y + v2.Z * axis.Z
-                        
-                        s = cyl_center + axis * t1
-                        e = cyl_center + axis * t2
-                        
-                        ln = rs.AddLine(s, e)
-                        if ln:
-                            rs.ObjectColor(ln, [0, 255, 0])  # Green for cylinder
-                            lines_created += 1
-                            print("   ✅ GREEN line created")
-                
-                else:
-                    print("❓ Other type")
+            # Face center
+            c = face.PointAt(face.Domain(0).Mid, face.Domain(1).Mid)
+            
+            ax = cone.Axis
+            s = c - ax * 2.5
+            e = c + ax * 2.5
+            
+            red_pairs.append((s, e))
+        
+        elif code == CYLINDER:
+            cyl = shape
+            diameter = cyl.Radius * 2
+            out.append("🔵 CYLINDER Ø{:.1f}mm".format(diameter))
+            
+            p1, p2 = face_axis_points(face)
+            cyl_items.append((p1, p2, cyl.Center, cyl.Axis))
+        
+        else:
+            out.append("❓ Other type")
+    
+    print("\n".join(out))
+    
+    # Project all cylinder edge points to their axes in one batch
+    green_pairs = project_axes(cyl_items)
+    
+    # Add all lines at once, without redrawing after each one
+    rs.EnableRedraw(False)
+    try:
+        green_ids = add_colored_lines(green_pairs, GREEN)
+        red_ids = add_colored_lines(red_pairs, RED)
+    finally:
+        rs.EnableRedraw(True)
+    
+    lines_created = len(green_ids) + len(red_ids)
+    print("\n✅ {} GREEN lines created".format(len(green_ids)))
+    print("✅ {} RED lines created".format(len(red_ids)))
     
     print("\n" + "="*80)
     print("✅ CREATED {} LINES".format(lines_created))
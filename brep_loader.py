@@ -0,0 +1,24 @@
+"""
+BREP LOADER
+===========
+Chooses between the precompiled brep_utils.dll (see build_brep_utils.py)
+and the brep_utils.py source. The scripts import this module right
+before importing brep_utils.
+
+The DLL is only used under IronPython and only while it is not older
+than brep_utils.py, so edits to the source are never shadowed by a
+stale build.
+"""
+
+import os
+import sys
+
+_here = os.path.dirname(os.path.abspath(__file__))
+_dll = os.path.join(_here, "brep_utils.dll")
+_src = os.path.join(_here, "brep_utils.py")
+
+if (sys.platform == "cli" and os.path.exists(_dll)
+        and (not os.path.exists(_src)
+             or os.path.getmtime(_dll) >= os.path.getmtime(_src))):
+    import clr
+    clr.AddReferenceToFileAndPath(_dll)
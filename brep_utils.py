@@ -0,0 +1,410 @@
+"""
+BREP UTILS
+==========
+Shared helpers for the Brep analysis scripts.
+
+- classify_faces(): classify every face of a Brep in one call
+- classify_and_collect(): single pass over faces, yields fitted shapes
+- face_axis_points(): face edge points at mid U, for axis projection
+- project_cyl_axis(): axis line of one cylindrical face
+- project_axes(): project point pairs onto cylinder axes in one batch
+- add_colored_lines(): add many lines of one color to the document
+- face_bounding_box(): tight bounding box, cached across script runs
+
+Face classification is done by a small C# helper that is compiled once
+per Rhino session and classifies all faces of a Brep inside .NET, spread
+over all cores with Parallel.For, so Python crosses into RhinoCommon once
+per Brep instead of several times per face.
+If the helper cannot be compiled (no CodeDom compiler, e.g. Rhino 8 on
+.NET Core) the same checks run in a plain Python loop.
+
+Usage:
+Put this file next to the scripts; they import it automatically.
+Optionally precompile it with build_brep_utils.py (IronPython), the
+scripts then load brep_utils.dll instead of parsing this file.
+"""
+
+import hashlib
+
+import Rhino
+import scriptcontext as sc
+import System.Drawing
+
+# NumPy is optional (Rhino 8 CPython), IronPython uses the plain loop
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Smallest batch sent through the NumPy kernel. Filling the arrays and
+# building the Point3d results still costs one Python step per item, so
+# the array path only pays off on very large batches; typical selections
+# in 04 stay on the plain loop (and skip the Numba JIT compile).
+ARRAY_MIN_ITEMS = 10000
+
+# Face type codes returned by classify_faces()
+PLANE = 0
+CYLINDER = 1
+CONE = 2
+NURBS = 3
+OTHER = 4
+
+# Surface classes counted as NURBS
+NURBS_CLASSES = frozenset(("NurbsSurface", "SumSurface", "RevSurface"))
+
+# Surface classes worth a TryGetCylinder/TryGetCone fit, anything else
+# (PlaneSurface...) can never succeed. BrepFace is what coercesurface
+# returns for surface objects, its real class is not known up front.
+CAN_BE_CYLINDER = frozenset(
+    ("RevSurface", "SumSurface", "NurbsSurface", "BrepFace"))
+CAN_BE_CONE = frozenset(("RevSurface", "NurbsSurface", "BrepFace"))
+
+_BBOX_CACHE_KEY = "brep_utils.bbox_cache"
+_NO_COMPILER_KEY = "brep_utils.no_csharp_compiler"
+
+# Same checks as _classify_face() below, keep both in sync: 01 counts with
+# this helper while 04 uses the Python version
+_CLASSIFIER_SOURCE = r"""
+using System.Threading.Tasks;
+using Rhino.Geometry;
+
+namespace BrepAnalysis
+{
+    public class FaceClassification
+    {
+        public byte[] Codes;
+        public double[] Radii;
+    }
+
+    public static class BrepClassifier
+    {
+        public static FaceClassification Classify(Brep brep, bool checkPlanar, bool cylindersOnly)
+        {
+            int count = brep.Faces.Count;
+            FaceClassification result = new FaceClassification();
+            result.Codes = new byte[count];
+            result.Radii = new double[count];
+
+            // The face list fills itself lazily on first access, which is
+            // not thread safe: collect the faces serially first
+            BrepFace[] faces = new BrepFace[count];
+            for (int i = 0; i < count; i++)
+                faces[i] = brep.Faces[i];
+
+            // Faces are independent and only read, each writes its own slot
+            Parallel.For(0, count, i =>
+            {
+                double radius;
+                result.Codes[i] = ClassifyFace(faces[i], checkPlanar, cylindersOnly, out radius);
+                result.Radii[i] = radius;
+            });
+
+            return result;
+        }
+
+        static byte ClassifyFace(BrepFace face, bool checkPlanar, bool cylindersOnly, out double radius)
+        {
+            Surface surf = face.UnderlyingSurface();
+            Cylinder cyl;
+            Cone cone;
+            radius = 0.0;
+
+            if (surf is PlaneSurface)
+                return 0;
+
+            bool canBeCylinder = surf is RevSurface || surf is SumSurface || surf is NurbsSurface;
+            bool canBeCone = surf is RevSurface || surf is NurbsSurface;
+
+            // Fit on surf (needed for the class checks anyway) with the
+            // default tolerance, so results match 02 and 03
+            if (canBeCylinder && surf.TryGetCylinder(out cyl))
+            {
+                radius = cyl.Radius;
+                return 1;
+            }
+
+            if (cylindersOnly)
+                return 4;
+
+            if (canBeCone && surf.TryGetCone(out cone))
+                return 2;
+
+            if (checkPlanar && surf is NurbsSurface && face.IsPlanar())
+                return 0;
+
+            if (surf is NurbsSurface || surf is SumSurface || surf is RevSurface)
+                return 3;
+
+            return 4;
+        }
+    }
+}
+"""
+
+# Keyed by the source, so an edited helper is recompiled in a running
+# session instead of reusing the old compiled type
+_CLASSIFIER_KEY = "brep_utils.BrepClassifier." + hashlib.md5(
+    _CLASSIFIER_SOURCE.encode("utf-8")).hexdigest()
+
+
+def _compile_classifier():
+    """Compile the C# classifier in memory, None if not possible."""
+    try:
+        import clr
+        from System.CodeDom.Compiler import CompilerParameters
+        from Microsoft.CSharp import CSharpCodeProvider
+
+        params = CompilerParameters()
+        params.GenerateInMemory = True
+        params.ReferencedAssemblies.Add("System.dll")
+        params.ReferencedAssemblies.Add(
+            clr.GetClrType(Rhino.Geometry.Brep).Assembly.Location)
+
+        results = CSharpCodeProvider().CompileAssemblyFromSource(
+            params, _CLASSIFIER_SOURCE)
+    except Exception as e:
+        # No usable C# compiler in this Rhino, don't retry this session
+        print("⚠️ C# classifier unavailable, using Python loop: {}".format(e))
+        sc.sticky[_NO_COMPILER_KEY] = True
+        return None
+
+    if results.Errors.HasErrors:
+        # Broken _CLASSIFIER_SOURCE: report it, retried on the next run
+        print("⚠️ C# classifier failed to compile, using Python loop: {}".format(
+            results.Errors[0]))
+        return None
+
+    # Take the type from this assembly, an older build in the same
+    # session defines the same namespace
+    return clr.GetPythonType(
+        results.CompiledAssembly.GetType("BrepAnalysis.BrepClassifier"))
+
+
+def _get_classifier():
+    """Compiled classifier, cached in sc.sticky once compiled."""
+    classifier = sc.sticky.get(_CLASSIFIER_KEY)
+    if classifier is None and not sc.sticky.get(_NO_COMPILER_KEY):
+        classifier = _compile_classifier()
+        if classifier is not None:
+            sc.sticky[_CLASSIFIER_KEY] = classifier
+    return classifier
+
+
+def _classify_face(face, check_planar, cylinders_only):
+    """Return (code, shape, stype) for one BrepFace: shape is the fitted
+    Cylinder or Cone (None for other codes), stype the surface class."""
+    surf = face.UnderlyingSurface()
+    stype = type(surf).__name__
+
+    # Cheapest check first: plane surfaces need no fitting
+    if isinstance(surf, Rhino.Geometry.PlaneSurface):
+        return PLANE, None, stype
+
+    # Fit on the surface already fetched for the class dispatch, with the
+    # default tolerance 02 and 03 use, so all scripts agree. Face-level
+    # fits with the model tolerance would save no UnderlyingSurface()
+    # call and would change which faces count as cylinders.
+    if stype in CAN_BE_CYLINDER:
+        is_cyl, cyl = surf.TryGetCylinder()
+        if is_cyl:
+            return CYLINDER, cyl, stype
+
+    # Only cylinders asked for, skip all remaining checks
+    if cylinders_only:
+        return OTHER, None, stype
+
+    if stype in CAN_BE_CONE:
+        is_cone, cone = surf.TryGetCone()
+        if is_cone:
+            return CONE, cone, stype
+
+    # Slow numeric fit, only on request
+    if check_planar and stype == "NurbsSurface" and face.IsPlanar():
+        return PLANE, None, stype
+
+    if stype in NURBS_CLASSES:
+        return NURBS, None, stype
+
+    return OTHER, None, stype
+
+
+def classify_and_collect(faces, check_planar=False, cylinders_only=False):
+    """
+    Classify BrepFaces in a single pass.
+
+    Yields (code, face, shape, stype) for every face, where shape is
+    the fitted Cylinder or Cone for CYLINDER and CONE faces and None
+    otherwise, and stype the class name of the underlying surface.
+    Callers can count the codes and build geometry from the shapes
+    without classifying the faces again.
+    """
+    for face in faces:
+        code, shape, stype = _classify_face(face, check_planar, cylinders_only)
+        yield code, face, shape, stype
+
+
+def classify_faces(brep, check_planar=False, cylinders_only=False):
+    """
+    Classify all faces of a Brep.
+
+    Returns two lists with one entry per face: type codes (PLANE,
+    CYLINDER, CONE, NURBS, OTHER) and cylinder radii (0.0 for faces
+    that are not cylinders).
+
+    Planes are detected by surface class (PlaneSurface). With
+    check_planar=True, NurbsSurface faces are also tested with the
+    slower IsPlanar() fit, for files where planes were stored as NURBS.
+
+    With cylinders_only=True only the cylinder fit runs: every face
+    that is not a cylinder is reported as PLANE (by class) or OTHER.
+    """
+    classifier = _get_classifier()
+
+    if classifier is not None:
+        try:
+            result = classifier.Classify(
+                brep, check_planar, cylinders_only)
+            return [int(c) for c in result.Codes], list(result.Radii)
+        except Exception as e:
+            print("⚠️ C# classifier failed, using Python loop: {}".format(e))
+
+    codes = []
+    radii = []
+    for code, face, shape, stype in classify_and_collect(
+            brep.Faces, check_planar, cylinders_only):
+        codes.append(code)
+        radii.append(shape.Radius if code == CYLINDER else 0.0)
+
+    return codes, radii
+
+
+def _project_pair(p1, p2, center, axis):
+    """Project p1 and p2 onto the axis line through center."""
+    # Vector3d * Vector3d is the dot product, one .NET call each
+    t1 = (p1 - center) * axis
+    t2 = (p2 - center) * axis
+
+    # Build start once, end is start moved along the axis
+    start = center + axis * t1
+    return start, start + axis * (t2 - t1)
+
+
+def face_axis_points(face):
+    """Return the points at mid U on both V edges of a face (p1, p2)."""
+    u_mid = face.Domain(0).Mid
+    dv = face.Domain(1)
+    return face.PointAt(u_mid, dv.Min), face.PointAt(u_mid, dv.Max)
+
+
+def project_cyl_axis(face, cyl):
+    """
+    Axis line of a cylindrical face.
+
+    The face edge points are projected onto the cylinder axis, so the
+    line runs from edge to edge of the face. Returns (start, end).
+    """
+    p1, p2 = face_axis_points(face)
+    return _project_pair(p1, p2, cyl.Center, cyl.Axis)
+
+
+def project_axes(items):
+    """
+    Project point pairs onto cylinder axes.
+
+    items is a list of (p1, p2, center, axis) tuples. Returns a list of
+    (start, end) Point3d tuples: p1 and p2 projected onto the axis line
+    through center. Batches of ARRAY_MIN_ITEMS or more go through the
+    kernels module when NumPy is available.
+    """
+    if np is None or len(items) < ARRAY_MIN_ITEMS:
+        return [_project_pair(*item) for item in items]
+
+    import kernels
+
+    n = len(items)
+    P1 = np.empty((n, 3))
+    P2 = np.empty((n, 3))
+    C = np.empty((n, 3))
+    A = np.empty((n, 3))
+
+    for i, (p1, p2, center, axis) in enumerate(items):
+        P1[i] = p1.X, p1.Y, p1.Z
+        P2[i] = p2.X, p2.Y, p2.Z
+        C[i] = center.X, center.Y, center.Z
+        A[i] = axis.X, axis.Y, axis.Z
+
+    S = np.empty((n, 3))
+    E = np.empty((n, 3))
+    kernels.project_axes(P1, P2, C, A, S, E)
+
+    Point3d = Rhino.Geometry.Point3d
+    return [(Point3d(*s), Point3d(*e)) for s, e in zip(S.tolist(), E.tolist())]
+
+
+def add_colored_lines(pairs, color):
+    """
+    Add (start, end) lines to the document with one object color.
+
+    The color is set on the object attributes, so each line is a single
+    document call instead of AddLine followed by ObjectColor. Returns
+    the ids of the added lines.
+    """
+    attrs = sc.doc.CreateDefaultAttributes()
+    attrs.ColorSource = Rhino.DocObjects.ObjectColorSource.ColorFromObject
+    attrs.ObjectColor = System.Drawing.Color.FromArgb(*color)
+
+    add_line = sc.doc.Objects.AddLine
+    ids = []
+    for start, end in pairs:
+        obj_id = add_line(start, end, attrs)
+        if obj_id != System.Guid.Empty:
+            ids.append(obj_id)
+
+    return ids
+
+
+def _on_object_changed(sender, e):
+    """Drop cached boxes of a replaced or deleted object."""
+    cache = sc.sticky.get(_BBOX_CACHE_KEY)
+    if cache:
+        obj_id = str(e.ObjectId)
+        for key in [k for k in cache if k[0] == obj_id]:
+            del cache[key]
+
+
+def _on_document_closed(sender, e):
+    """Drop all cached boxes, object ids belong to the closed document."""
+    cache = sc.sticky.get(_BBOX_CACHE_KEY)
+    if cache:
+        cache.clear()
+
+
+def _bbox_cache():
+    """Bounding box cache in sc.sticky, created once per session."""
+    cache = sc.sticky.get(_BBOX_CACHE_KEY)
+    if cache is None:
+        cache = {}
+        sc.sticky[_BBOX_CACHE_KEY] = cache
+        Rhino.RhinoDoc.ReplaceRhinoObject += _on_object_changed
+        Rhino.RhinoDoc.DeleteRhinoObject += _on_object_changed
+        Rhino.RhinoDoc.CloseDocument += _on_document_closed
+    return cache
+
+
+def face_bounding_box(obj_id, face_idx, surf):
+    """
+    Tight bounding box of surf, face face_idx of object obj_id.
+
+    The box is cached in sc.sticky so analysing the same object again
+    skips the computation. Entries are dropped when the object is
+    replaced or deleted, or the document is closed.
+    """
+    cache = _bbox_cache()
+    key = (str(obj_id), face_idx)
+
+    bbox = cache.get(key)
+    if bbox is None:
+        bbox = surf.GetBoundingBox(True)
+        cache[key] = bbox
+
+    return bbox
@@ -0,0 +1,26 @@
+"""
+BUILD BREP UTILS
+================
+Compiles brep_utils.py into brep_utils.dll with IronPython.
+
+The scripts load the DLL through brep_loader.py, so IronPython
+does not have to parse and compile brep_utils.py on every run.
+
+Usage:
+1. Run with IronPython (ipy build_brep_utils.py) or from the
+   RhinoPython editor
+2. brep_utils.dll is created next to this script
+3. Rebuild after changing brep_utils.py: until then the scripts see
+   the DLL is older than the source and import the source instead
+"""
+
+import os
+
+import clr
+
+here = os.path.dirname(os.path.abspath(__file__))
+dll = os.path.join(here, "brep_utils.dll")
+
+clr.CompileModules(dll, os.path.join(here, "brep_utils.py"))
+
+print("✅ Created {}".format(dll))
@@ -0,0 +1,47 @@
+"""
+KERNELS
+=======
+Array kernels for batch geometry math used by brep_utils.
+
+- project_axes(): project point pairs onto axis lines
+
+Needs NumPy, so it is only imported under CPython (Rhino 8). Numba is
+optional: with it the kernel is JIT-compiled and runs in parallel over
+all rows, without it the same math runs as NumPy array expressions.
+
+All arrays are (N, 3) float64, one row per item.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _project_axes_numpy(P1, P2, C, A, S, E):
+    """Project P1/P2 onto the axes (C, A), write endpoints to S/E."""
+    t1 = np.einsum('ij,ij->i', P1 - C, A)
+    t2 = np.einsum('ij,ij->i', P2 - C, A)
+    S[:] = C + A * t1[:, None]
+    E[:] = C + A * t2[:, None]
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def project_axes(P1, P2, C, A, S, E):
+        """Project P1/P2 onto the axes (C, A), write endpoints to S/E."""
+        for i in prange(P1.shape[0]):
+            t1 = ((P1[i, 0] - C[i, 0]) * A[i, 0]
+                  + (P1[i, 1] - C[i, 1]) * A[i, 1]
+                  + (P1[i, 2] - C[i, 2]) * A[i, 2])
+            t2 = ((P2[i, 0] - C[i, 0]) * A[i, 0]
+                  + (P2[i, 1] - C[i, 1]) * A[i, 1]
+                  + (P2[i, 2] - C[i, 2]) * A[i, 2])
+
+            for k in range(3):
+                S[i, k] = C[i, k] + A[i, k] * t1
+                E[i, k] = C[i, k] + A[i, k] * t2
+else:
+    project_axes = _project_axes_numpy